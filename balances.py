@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 import sqlite3
-from datetime import datetime, date, timedelta
+from datetime import datetime, date
 from decimal import Decimal
-from typing import List
+from typing import Iterator, List, Optional, Tuple, Union
 
 
 class BalanceEvent:
@@ -14,14 +14,18 @@ class BalanceEvent:
        - ipb:          interest payable balance amount that has accrued and has yet to be paid associated to this event
        - current_amt:  the current balance amount of instance event
        - original_amt: the initial balance amount of instance event
-       - event_date:   the date when event happens
+       - event_date:   the date when event happens as a proleptic Gregorian ordinal (see date.toordinal())
        - event_type:   the event type, supported types: "advance" and "payment"
+    All amounts are integers in fixed-point units (see BalanceStatisticsCalculator.AMOUNT_SCALE).
     """
+    # one instance is created per event record, so use slots instead of a per-instance __dict__.
+    __slots__ = ("event_id", "ipb", "current_amt", "original_amt", "event_date", "event_type")
+
     def __init__(self, event_id: int,
-                 interest_payable_balance: Decimal = Decimal(0),
-                 current_amt: Decimal = Decimal(0),
-                 original_amt: Decimal = Decimal(0),
-                 event_date: date = None,
+                 interest_payable_balance: int = 0,
+                 current_amt: int = 0,
+                 original_amt: int = 0,
+                 event_date: int = None,
                  event_type: str = None):
 
         self.event_id = event_id
@@ -48,30 +52,39 @@ class BalanceStatisticsCalculator:
             - current_amt:  the final event balance amount after statistics calculation
             - original_amt: the initial event balance amount
             - ipb:          the amount of interest that has accrued and has yet to be paid associated to this event
-            - event_date:   the date when event happens
+            - event_date:   the date when event happens as an ordinal, use date.fromordinal() to convert it back
+    All amounts are kept as integers in fixed-point units of 1 / AMOUNT_SCALE, use to_decimal() to convert them back.
     """
     # constants of the class
-    ACCRUED_INTEREST_CONSTANT = Decimal(0.00035)
-    DATE_FORMAT = "%Y-%m-%d"
+    # amounts are scaled by AMOUNT_SCALE so that calculations run over native ints instead of Decimal objects,
+    # the accrued interest constant 0.00035 is represented exactly as ACCRUED_INTEREST_SCALED / ACCRUED_INTEREST_DIVISOR
+    AMOUNT_SCALE = 10 ** 8
+    ACCRUED_INTEREST_SCALED = 35
+    ACCRUED_INTEREST_DIVISOR = 10 ** 5
     ADVANCE = "advance"
     PAYMENT = "payment"
+    DATE_FORMAT = "%Y-%m-%d"
 
-    def __init__(self, db_path: str, end_date: str = str(datetime.now().date())):
+    def __init__(self, db_path: str, end_date: str = None):
         """
         Initializes the BalanceStatisticsCalculator. Optionally you can pass end_date to limit event records
         to work with during statistics calculation.
         :param db_path:   database connection path.
-        :param end_date:  upper limit date of the event records to work with. default: today's date
+        :param end_date:  upper limit date of the event records to work with in "YYYY-MM-DD" format.
+                          default: today's date
         """
         # init the end date to filter event records with the min date between today and given end date param.
-        self._end_date = min(datetime.now().date(), datetime.strptime(end_date, self.DATE_FORMAT).date())
+        today = date.today()
+        self._end_date = today if end_date is None else min(today, datetime.strptime(end_date, self.DATE_FORMAT).date())
+        # ordinal of the end date, so that dates comparisons and differences within calculations are int operations.
+        self._end_date_ord = self._end_date.toordinal()
         self._db_path = db_path
 
         # init variables where will preserve overall the balance statistics calculation
-        self._overall_advance_balance = Decimal(0)
-        self._overall_interest_payable_balance = Decimal(0)
-        self._overall_interest_paid = Decimal(0)
-        self._overall_payments_for_future = Decimal(0)
+        self._overall_advance_balance = 0
+        self._overall_interest_payable_balance = 0
+        self._overall_interest_paid = 0
+        self._overall_payments_for_future = 0
 
         # internal variables to perform balance event statistics
         # self._advance_events will contain all balance advance events sort by its creation date
@@ -110,6 +123,40 @@ class BalanceStatisticsCalculator:
         old_active_adv_id = 0   # id to the oldest active advance event in self._advance_event
         old_active_pay_id = 0   # id to the oldest active payment event in self._payment_event
 
+        # bind instance and class attributes used within the loops to locals to avoid attribute lookups per iteration.
+        adv_events = self._advance_events
+        pay_events = self._payment_events
+        n_adv = len(adv_events)
+        n_pay = len(pay_events)
+        old_adv_event_by_date_dict = self._old_adv_event_by_date_dict
+        advance_type = self.ADVANCE
+        payment_type = self.PAYMENT
+        interest_scaled = self.ACCRUED_INTEREST_SCALED
+        interest_divisor = self.ACCRUED_INTEREST_DIVISOR
+        end_date_ord = self._end_date_ord
+        # overall statistics are accumulated in locals during the loops and stored back once they end.
+        overall_advance_balance = self._overall_advance_balance
+        overall_interest_payable_balance = self._overall_interest_payable_balance
+        overall_interest_paid = self._overall_interest_paid
+        overall_payments_for_future = self._overall_payments_for_future
+
+        def get_next_event(adv_id: int, pay_id: int) -> Tuple[Optional[BalanceEvent], int]:
+            """
+            Get the next event to be processed and its date (as ordinal) from given event adv_id and pay_id.
+            The next event is the oldest one between adv_events[adv_id] and pay_events[pay_id] (payment first when
+            both have the same date) that is not after the end date.
+            In case no next event to process (ids overflow its event arrays or events are after the end date) return
+            None and the end date plus extra day.
+            """
+            adv_event = adv_events[adv_id] if adv_id < n_adv else None
+            pay_event = pay_events[pay_id] if pay_id < n_pay else None
+            if pay_event is not None and pay_event.event_date <= end_date_ord and \
+                    (adv_event is None or pay_event.event_date <= adv_event.event_date):
+                return pay_event, pay_event.event_date
+            if adv_event is not None and adv_event.event_date <= end_date_ord:
+                return adv_event, adv_event.event_date
+            return None, end_date_ord + 1
+
         # Balance Statistics calculations, main loop there are 2 scenarios:
         # 1) The event to process is PAYMENT: following "Payment Calculations" in documentation apply following steps:
         #    a) first try to reduce as much as possible the "interest payable balance" for those active advance events
@@ -125,31 +172,34 @@ class BalanceStatisticsCalculator:
         # that new sum of all advance balances debt will generate in future days.
         # Formula:
         #     event's ipb = 0.00035 x "sum of all advance balances" x days between event's date and next event date.
-        # During the loops we'll update "self._overall_xxxx", place where we'll find final balance statistics results.
-        to_process_event = self._get_next_event_to_process(adv_id=adv_id, pay_id=pay_id)
+        # Event dates are ordinals kept along with the event to process, so days between them is an int subtraction.
+        # During the loops we'll update "overall_xxxx" locals, stored back in "self._overall_xxxx" once the loop ends.
+        # Balance Applicable to Future Advances is kept as a running total of the payments' current amounts: it grows
+        # with what is left of each processed payment and shrinks when advances consume those payments.
+        to_process_event, to_process_date = get_next_event(adv_id=adv_id, pay_id=pay_id)
         while to_process_event is not None:
 
             # PAYMENT case
-            if to_process_event.event_type == self.PAYMENT:
+            if to_process_event.event_type == payment_type:
                 # loop to cancel active interest payable balances while payment event has money, details explained in a)
                 old_active_ipb_adv_id = old_active_adv_id
-                while old_active_ipb_adv_id < len(self._advance_events) and \
+                while old_active_ipb_adv_id < n_adv and \
                         to_process_event.current_amt > 0 and \
-                        to_process_event.event_date > self._advance_events[old_active_ipb_adv_id].event_date:
+                        to_process_date > adv_events[old_active_ipb_adv_id].event_date:
 
                     # get reference of the oldest active advance with ipb to pay to simplify code below
-                    self._old_active_ipb_adv_event = self._advance_events[old_active_ipb_adv_id]
+                    self._old_active_ipb_adv_event = adv_events[old_active_ipb_adv_id]
 
                     if to_process_event.current_amt >= self._old_active_ipb_adv_event.ipb:
-                        self._overall_interest_paid += self._old_active_ipb_adv_event.ipb
-                        self._overall_interest_payable_balance -= self._old_active_ipb_adv_event.ipb
+                        overall_interest_paid += self._old_active_ipb_adv_event.ipb
+                        overall_interest_payable_balance -= self._old_active_ipb_adv_event.ipb
                         to_process_event.current_amt -= self._old_active_ipb_adv_event.ipb
-                        self._old_active_ipb_adv_event.ipb = Decimal(0)
+                        self._old_active_ipb_adv_event.ipb = 0
                     else:
-                        self._overall_interest_paid += to_process_event.current_amt
-                        self._overall_interest_payable_balance -= to_process_event.current_amt
+                        overall_interest_paid += to_process_event.current_amt
+                        overall_interest_payable_balance -= to_process_event.current_amt
                         self._old_active_ipb_adv_event.ipb -= to_process_event.current_amt
-                        to_process_event.current_amt = Decimal(0)
+                        to_process_event.current_amt = 0
 
                     # when advance ipb are totally debt, move id to the next "new" oldest advance with ipb to be paid,
                     # otherwise it was consumed all payment amount, then move id to the next "new" oldest payment.
@@ -159,22 +209,22 @@ class BalanceStatisticsCalculator:
                         old_active_pay_id += 1
 
                 # loop to cancel active advances debt while payment event has money, details explained in b)
-                while old_active_adv_id < len(self._advance_events) and \
+                while old_active_adv_id < n_adv and \
                         to_process_event.current_amt > 0 and \
-                        to_process_event.event_date > self._advance_events[old_active_adv_id].event_date:
+                        to_process_date > adv_events[old_active_adv_id].event_date:
 
                     # get and preserve the oldest active advance balance event reference for future interest calculation
-                    self._old_active_adv_event = self._advance_events[old_active_adv_id]
+                    self._old_active_adv_event = adv_events[old_active_adv_id]
 
                     # try to cancel the current advance amount debt
                     if to_process_event.current_amt > self._old_active_adv_event.current_amt:
-                        self._overall_advance_balance -= self._old_active_adv_event.current_amt
+                        overall_advance_balance -= self._old_active_adv_event.current_amt
                         to_process_event.current_amt -= self._old_active_adv_event.current_amt
-                        self._old_active_adv_event.current_amt = Decimal(0)
+                        self._old_active_adv_event.current_amt = 0
                     else:
-                        self._overall_advance_balance -= to_process_event.current_amt
+                        overall_advance_balance -= to_process_event.current_amt
                         self._old_active_adv_event.current_amt -= to_process_event.current_amt
-                        to_process_event.current_amt = Decimal(0)
+                        to_process_event.current_amt = 0
 
                     # when oldest advance amount and its interest are totally debt move id to the next "new" oldest
                     # advance to be paid, otherwise it was consumed all payment amount then move id to the next
@@ -184,33 +234,38 @@ class BalanceStatisticsCalculator:
                     else:
                         old_active_pay_id += 1
 
+                # whatever remains of the payment amount is applicable to future advances.
+                overall_payments_for_future += to_process_event.current_amt
+
                 # calculate the new interest payable balance that current debt will generate in future days.
-                next_event_date = self._get_next_event_date(adv_id=adv_id, pay_id=pay_id + 1)
-                self._old_active_adv_event.ipb = Decimal((next_event_date - to_process_event.event_date).days) *\
-                    Decimal(self.ACCRUED_INTEREST_CONSTANT * self._overall_advance_balance)
-                self._overall_interest_payable_balance += self._old_active_adv_event.ipb
+                next_event, next_event_date = get_next_event(adv_id=adv_id, pay_id=pay_id + 1)
+                self._old_active_adv_event.ipb = (next_event_date - to_process_date) * \
+                    interest_scaled * overall_advance_balance // interest_divisor
+                overall_interest_payable_balance += self._old_active_adv_event.ipb
 
                 # move current payment id to the next payment event to be processed in the list.
                 pay_id += 1
 
             # ADVANCE case
-            if to_process_event.event_type == self.ADVANCE:
+            if to_process_event.event_type == advance_type:
                 # loop to cancel the debt and interests in current advance while payment events in the past
                 # has money for, details explained in 2).
-                while old_active_pay_id < len(self._payment_events) and \
-                        to_process_event.event_date >= self._payment_events[old_active_pay_id].event_date and \
-                        to_process_event.current_amt > 0 and self._payment_events[old_active_pay_id].current_amt > 0:
+                while old_active_pay_id < n_pay and \
+                        to_process_date >= pay_events[old_active_pay_id].event_date and \
+                        to_process_event.current_amt > 0 and pay_events[old_active_pay_id].current_amt > 0:
 
                     # get the oldest payment event reference to simplify the read of code below.
-                    self._old_active_pay_event = self._payment_events[old_active_pay_id]
+                    self._old_active_pay_event = pay_events[old_active_pay_id]
 
                     #  try to reduce current advance amount with the oldest active payment
                     if to_process_event.current_amt > self._old_active_pay_event.current_amt:
+                        overall_payments_for_future -= self._old_active_pay_event.current_amt
                         to_process_event.current_amt -= self._old_active_pay_event.current_amt
-                        self._old_active_pay_event.current_amt = Decimal(0)
+                        self._old_active_pay_event.current_amt = 0
                     else:
+                        overall_payments_for_future -= to_process_event.current_amt
                         self._old_active_pay_event.current_amt -= to_process_event.current_amt
-                        to_process_event.current_amt = Decimal(0)
+                        to_process_event.current_amt = 0
 
                     # when the oldest active advance was totally cancel move it to the "new" oldest advance,
                     # otherwise move the payment to the next "new" oldest payment to continue try to cancel the
@@ -221,102 +276,52 @@ class BalanceStatisticsCalculator:
                         old_active_adv_id += 1
 
                 # calculate the new interest payable balance that current debt will generate in future days.
-                self._overall_advance_balance += to_process_event.current_amt
-                next_event_date = self._get_next_event_date(adv_id=adv_id + 1, pay_id=pay_id)
-                old_adv_event_by_date = self._old_adv_event_by_date_dict[to_process_event.event_date]
-                old_adv_event_by_date.ipb = Decimal((next_event_date - to_process_event.event_date).days) * \
-                    Decimal(self.ACCRUED_INTEREST_CONSTANT * self._overall_advance_balance)
-                self._overall_interest_payable_balance += old_adv_event_by_date.ipb
+                overall_advance_balance += to_process_event.current_amt
+                next_event, next_event_date = get_next_event(adv_id=adv_id + 1, pay_id=pay_id)
+                old_adv_event_by_date = old_adv_event_by_date_dict[to_process_date]
+                old_adv_event_by_date.ipb = (next_event_date - to_process_date) * \
+                    interest_scaled * overall_advance_balance // interest_divisor
+                overall_interest_payable_balance += old_adv_event_by_date.ipb
 
                 # move current advance id to the next payment event to be processed in the list.
                 adv_id += 1
 
-            # get the next event to be processed.
-            to_process_event = self._get_next_event_to_process(adv_id=adv_id, pay_id=pay_id)
+            # the next event to be processed was already got when calculating the interest payable balance.
+            to_process_event, to_process_date = next_event, next_event_date
 
-        # before statistics calculation ends get Balance Applicable to Future Advances as sum overall
-        # payments balance's current amount.
-        self._overall_payments_for_future = sum([payment_event.current_amt for payment_event in self._payment_events])
+        self._overall_advance_balance = overall_advance_balance
+        self._overall_interest_payable_balance = overall_interest_payable_balance
+        self._overall_interest_paid = overall_interest_paid
+        self._overall_payments_for_future = overall_payments_for_future
 
-    def _get_next_event_to_process(self, adv_id: int, pay_id: int):
-        """
-        Get the next event to be processed from given event adv_id and pay_id and next event date.
-        In case some or both ids overflow its event arrays respectively, it means no next event to process and
-        in that case return None.
-        :param adv_id:      id of advance event to check if that event is the next event process or not
-        :param pay_id       id of payment event to check if that event is the next event process or not
-        :return: BalanceEvent instance with the next event to be processed or None
-        """
-        next_event_date = self._get_next_event_date(adv_id, pay_id)
-        pay_event = None
-        if pay_id < len(self._payment_events):
-            pay_event = self._payment_events[pay_id]
-
-        adv_event = None
-        if adv_id < len(self._advance_events):
-            adv_event = self._advance_events[adv_id]
-
-        if pay_event is not None and pay_event.event_date == next_event_date:
-            return pay_event
-        elif adv_event is not None and adv_event.event_date == next_event_date:
-            return adv_event
-
-        return None
-
-    def _get_next_event_date(self, adv_id: int, pay_id: int) -> date:
-        """
-        Method to get the date of the next event within three following dates:
-            - the advance event date (get from self._advance_event[adv_id])
-            - the payment event date (get from self._payment_event[adv_id])
-            - the instance end_date
-        by default return the current instance end_date plus extra date.
-        """
-        adv_event = None
-        if adv_id < len(self._advance_events):
-            adv_event = self._advance_events[adv_id]
-
-        pay_event = None
-        if pay_id < len(self._payment_events):
-            pay_event = self._payment_events[pay_id]
-
-        next_event_date = self._end_date + timedelta(days=1)
-        if adv_event is not None and pay_event is not None:
-            if adv_event.event_date < pay_event.event_date:
-                next_event_date = adv_event.event_date
-            elif pay_event.event_date <= self._end_date:
-                next_event_date = pay_event.event_date
-        elif adv_event is not None:
-            if adv_event.event_date <= self._end_date:
-                next_event_date = adv_event.event_date
-        elif pay_event is not None:
-            if pay_event.event_date <= self._end_date:
-                next_event_date = pay_event.event_date
-
-        return next_event_date
-
-    def _get_event_records_by_date_from_db(self) -> List[dict]:
+    def _get_event_records_by_date_from_db(self) -> Iterator[tuple]:
         """
         Retrieve event records from database filter them by date created and sort by date_created and type.
-        return: list with event db records as a dict with { key: table field name, value: record's field value }
-                record ex: {"id": 1, "type": "advance", "amount": 32312, "date_created": "2020-04-21"}
+        Dates are converted by sqlite itself, amounts are returned as stored and converted with to_fixed_point(), since
+        scaling them within sqlite overflows its 64 bits integers for large amounts.
+        Records are streamed from the db cursor as they are read, so they are never materialized all together.
+        return: iterator over event db records as tuples with (id, type, amount, date_created) fields, where:
+                - amount is the stored int or float amount
+                - date_created is the date proleptic Gregorian ordinal (see date.toordinal())
+                record ex: (1, "advance", 32312.0, 737536)
         """
         # query events from database by date and sort by date and type.
         # It uses self._end_date value as upper date limit to filter records.
         with sqlite3.connect(self._db_path) as connection:
+            # per connection tuning for the date ordered scan: memory map the db file (256MB), 64MB of page cache
+            # and in memory temporary storage.
+            connection.execute("PRAGMA mmap_size=268435456;")
+            connection.execute("PRAGMA cache_size=-65536;")
+            connection.execute("PRAGMA temp_store=MEMORY;")
             cursor = connection.cursor()
-            result = cursor.execute("SELECT * "
-                                    "FROM events "
-                                    "WHERE date_created <= ?" 
-                                    "ORDER BY date_created ASC, type DESC;",
-                                    (self._end_date,))
-
-            # convert db event tuples to dictionary by add fields description as a key
-            # and their tuple value as dictionary value.
-            # ex: {"id": 1, "type": "advance", "amount": 32312, "date_created": "2020-04-21"}
-            fields = [field_md[0] for field_md in cursor.description]
-            event_records = [dict(zip(fields, row)) for row in result.fetchall()]
-
-            return event_records
+            yield from cursor.execute("SELECT id, "
+                                      "       type, "
+                                      "       amount, "
+                                      "       CAST(julianday(date_created) - julianday('0001-01-01') AS INTEGER) + 1 "
+                                      "FROM events "
+                                      "WHERE date_created <= ? "
+                                      "ORDER BY date_created ASC, type DESC;",
+                                      (self._end_date,))
 
     def _init_internal_variables(self):
         """
@@ -324,33 +329,62 @@ class BalanceStatisticsCalculator:
         """
         # init internal advance_events and payment_events lists with BalanceEvents objects
         # build from event records in db.
-        event_records = self._get_event_records_by_date_from_db()
-        for event_record in event_records:
+        # Records come sorted by date, so within the same pass init instance dictionary
+        # self._old_adv_event_by_date_dict with advance events as following:
+        # - key: advance event date.
+        # - value: the oldest advance event object reference for that date (the first one seen).
+        # bind list appends and dict setdefault to locals so the loop body (run per record) avoids attribute lookups.
+        append_advance = self._advance_events.append
+        append_payment = self._payment_events.append
+        set_old_adv_event_by_date = self._old_adv_event_by_date_dict.setdefault
+        to_fixed_point = self.to_fixed_point
+        advance_type = self.ADVANCE
+        for event_id, event_type, amount, date_created in self._get_event_records_by_date_from_db():
+            amount = to_fixed_point(amount)
             balance_event = BalanceEvent(
-                event_id=int(event_record["id"]),
-                original_amt=Decimal(event_record["amount"]),
-                current_amt=Decimal(event_record["amount"]),
-                event_date=datetime.strptime(event_record["date_created"], self.DATE_FORMAT).date(),
-                event_type=event_record["type"]
+                event_id=event_id,
+                original_amt=amount,
+                current_amt=amount,
+                event_date=date_created,
+                event_type=event_type
             )
-            if balance_event.event_type == self.ADVANCE:
-                self._advance_events.append(balance_event)
-
-            if balance_event.event_type == self.PAYMENT:
-                self._payment_events.append(balance_event)
-
-        # init instance dictionary self._old_adv_event_by_date_dict with advance events as following:
-        # - key: advance event date.
-        # - value: the oldest advance event object reference for that date.
-        for advance_event in self._advance_events:
-            if advance_event.event_date not in self._old_adv_event_by_date_dict:
-                self._old_adv_event_by_date_dict[advance_event.event_date] = advance_event
+            if event_type == advance_type:
+                append_advance(balance_event)
+                set_old_adv_event_by_date(date_created, balance_event)
+            else:
+                # events table only allows "advance" and "payment" types.
+                append_payment(balance_event)
 
         # init the oldest advance and payment events references with the first event elements
         self._old_active_adv_event = self._advance_events[0] if len(self._advance_events) > 0 else None
         self._old_active_ipb_adv_event = self._advance_events[0] if len(self._advance_events) > 0 else None
         self._old_active_pay_event = self._payment_events[0] if len(self._payment_events) > 0 else None
 
+    @classmethod
+    def to_fixed_point(cls, amount: Union[int, float]) -> int:
+        """
+        Convert an amount as stored in the database to the fixed-point amount used during calculations.
+        Floats are converted through their shortest str(), so e.g. 3231.2 is scaled exactly as 3231.2 and not as its
+        binary approximation, and ints are scaled as they are, without any size limit.
+        :param amount:  amount read from the events table
+        :return: int with the amount in fixed-point units of 1 / AMOUNT_SCALE
+        """
+        if amount.__class__ is int:
+            return amount * cls.AMOUNT_SCALE
+        return round(Decimal(str(amount)) * cls.AMOUNT_SCALE)
+
+    @classmethod
+    def to_decimal(cls, amount: int) -> Decimal:
+        """
+        Convert a fixed-point amount used during calculations back to its Decimal value.
+        :param amount:  amount in fixed-point units of 1 / AMOUNT_SCALE
+        :return: Decimal with the amount value
+        """
+        return Decimal(amount) / cls.AMOUNT_SCALE
+
+    def get_end_date(self) -> date:
+        return self._end_date
+
     # Getters methods to retrieve the overall statistics results after calculate_statistics_balance() run.
     def get_advance_events(self) -> List[BalanceEvent]:
         return self._advance_events
@@ -359,14 +393,14 @@ class BalanceStatisticsCalculator:
         return self._payment_events
 
     def get_overall_advance_balance(self) -> Decimal:
-        return abs(self._overall_advance_balance)
+        return self.to_decimal(abs(self._overall_advance_balance))
 
     def get_overall_interest_payable_balance(self) -> Decimal:
-        return abs(self._overall_interest_payable_balance)
+        return self.to_decimal(abs(self._overall_interest_payable_balance))
 
     def get_overall_interest_paid(self) -> Decimal:
-        return abs(self._overall_interest_paid)
+        return self.to_decimal(abs(self._overall_interest_paid))
 
     def get_overall_payments_for_future(self) -> Decimal:
-        return abs(self._overall_payments_for_future)
+        return self.to_decimal(abs(self._overall_payments_for_future))
 
@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
 import click
 import csv
+import hashlib
 import os
+import pickle
 import sqlite3
+from datetime import date
+from operator import itemgetter
 from typing import Dict
 from balances import BalanceStatisticsCalculator
 
@@ -48,6 +52,8 @@ def create_db(ctx: Dict) -> None:
             );
         """
         )
+        # index to serve balances query filter and sorting (WHERE date_created <= ? ORDER BY date_created, type DESC)
+        cursor.execute("create index idx_events_date_type on events (date_created asc, type desc);")
         connection.commit()
     click.echo(f"Initialized database at {ctx.obj['DB_PATH']}")
 
@@ -72,20 +78,90 @@ def load(ctx: Dict, filename: str) -> None:
         click.echo(f"Database does not exist at {ctx.obj['DB_PATH']}, please create it using `create-db` command")
         return
 
-    loaded = 0
     with open(filename) as infile, sqlite3.connect(ctx.obj["DB_PATH"]) as connection:
         cursor = connection.cursor()
         reader = csv.reader(infile)
-        for row in reader:
-            cursor.execute(
-                f"insert into events (type, amount, date_created) values (?, ?, ?)", (row[0], row[2], row[1])
-            )
-            loaded += 1
+        # reorder csv columns TYPE,DATE,AMOUNT into insert params (type, amount, date_created) at C level.
+        cursor.executemany(
+            "insert into events (type, amount, date_created) values (?, ?, ?)", map(itemgetter(0, 2, 1), reader)
+        )
+        loaded = cursor.rowcount
         connection.commit()
 
     click.echo(f"Loaded {loaded} events from {filename}")
 
 
+# version of the balances results cache entries, bump it whenever BalanceStatisticsCalculator pickled state or its
+# calculated results change.
+BALANCES_CACHE_VERSION = 2
+
+
+def _db_state_key(db_path: str) -> str:
+    """
+    Build a key of the database file state: size and modification time of the main file and of its WAL file (when
+    present), since WAL mode writers commit to the "-wal" file without touching the main one.
+    Raises OSError when the database does not exist.
+    """
+    db_stat = os.stat(db_path)
+    state = [db_stat.st_size, db_stat.st_mtime_ns]
+    try:
+        wal_stat = os.stat(f"{db_path}-wal")
+        state.extend([wal_stat.st_size, wal_stat.st_mtime_ns])
+    except OSError:
+        pass
+    return "-".join(str(value) for value in state)
+
+
+def calculate_balance_statistics(db_path: str, end_date: str = None) -> BalanceStatisticsCalculator:
+    """
+    Run balance statistics calculations over the given database, memoizing the results on disk.
+    Results are cached under $XDG_CACHE_HOME/ampla (default: ~/.cache/ampla) keyed by the database path, the state
+    of its main and WAL files, the cache version and amounts scale plus the effective end date, so any write to the
+    database invalidates them. Entries of a previous database state are removed when a new one is written.
+    """
+    bsc = BalanceStatisticsCalculator(db_path=db_path, end_date=end_date)
+    try:
+        db_state_key = _db_state_key(db_path)
+    except OSError:
+        # nothing to key the cache with, just run the calculations.
+        bsc.calculate_balance_statistics()
+        return bsc
+
+    db_key = hashlib.sha1(os.path.abspath(db_path).encode()).hexdigest()[:16]
+    state_key = hashlib.sha1(
+        f"{BALANCES_CACHE_VERSION}:{BalanceStatisticsCalculator.AMOUNT_SCALE}:{db_state_key}".encode()
+    ).hexdigest()[:16]
+    cache_dir = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "ampla")
+    cache_name = f"balances_{db_key}_{state_key}_{bsc.get_end_date()}.pkl"
+    cache_path = os.path.join(cache_dir, cache_name)
+    try:
+        with open(cache_path, "rb") as cache_file:
+            cached_bsc = pickle.load(cache_file)
+        if isinstance(cached_bsc, BalanceStatisticsCalculator):
+            return cached_bsc
+    except Exception:
+        # reading the cache is best effort too, unreadable or damaged entries are recalculated and overwritten.
+        pass
+
+    bsc.calculate_balance_statistics()
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # write to a temporary file first so concurrent runs never read a partially written cache entry.
+        tmp_cache_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_cache_path, "wb") as cache_file:
+            pickle.dump(bsc, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_cache_path, cache_path)
+
+        # prune the entries of this database previous states, they can not be hit anymore.
+        for entry in os.listdir(cache_dir):
+            if entry.startswith(f"balances_{db_key}_") and not entry.startswith(f"balances_{db_key}_{state_key}_"):
+                os.remove(os.path.join(cache_dir, entry))
+    except OSError:
+        # caching is best effort, results are already calculated.
+        pass
+    return bsc
+
+
 @interface.command()
 @click.argument("end_date", required=False, type=click.STRING)
 @click.pass_context
@@ -93,25 +169,30 @@ def balances(ctx: Dict, end_date: str = None) -> None:
     """Display balance statistics as of `end_date`."""
 
     # run balance statistics calculations
-    bsc = BalanceStatisticsCalculator(db_path=ctx.obj['DB_PATH'], end_date=end_date)
-    bsc.calculate_balance_statistics()
-
-    # print advance event details status after balance calculation execution.
-    click.echo("Advances:")
-    click.echo("----------------------------------------------------------")
-    click.echo("{0:>10}{1:>11}{2:>17}{3:>20}".format("Identifier", "Date", "Initial Amt", "Current Balance"))
-    for index, advance_event in enumerate(bsc.get_advance_events()):
-        click.echo("{0:>10}{1:>11}{2:>17.2f}{3:>20.2f}".format(index + 1,
-                                                               str(advance_event.event_date),
-                                                               advance_event.original_amt,
-                                                               advance_event.current_amt))
-    # print summary balance statistics
-    click.echo("\nSummary Statistics:")
-    click.echo("----------------------------------------------------------")
-    click.echo("Aggregate Advance Balance: {0:31.2f}".format(bsc.get_overall_advance_balance()))
-    click.echo("Interest Payable Balance: {0:32.2f}".format(bsc.get_overall_interest_payable_balance()))
-    click.echo("Total Interest Paid: {0:37.2f}".format(bsc.get_overall_interest_paid()))
-    click.echo("Balance Applicable to Future Advances: {0:>19.2f}".format(bsc.get_overall_payments_for_future()))
+    bsc = calculate_balance_statistics(db_path=ctx.obj['DB_PATH'], end_date=end_date)
+
+    # build the whole report and print it at once: advance event details status after balance calculation
+    # execution followed by summary balance statistics.
+    lines = [
+        "Advances:",
+        "----------------------------------------------------------",
+        "{0:>10}{1:>11}{2:>17}{3:>20}".format("Identifier", "Date", "Initial Amt", "Current Balance"),
+    ]
+    advance_line_format = "{0:>10}{1:>11}{2:>17.2f}{3:>20.2f}".format
+    lines.extend(advance_line_format(index + 1,
+                                     str(date.fromordinal(advance_event.event_date)),
+                                     bsc.to_decimal(advance_event.original_amt),
+                                     bsc.to_decimal(advance_event.current_amt))
+                 for index, advance_event in enumerate(bsc.get_advance_events()))
+    lines.extend([
+        "\nSummary Statistics:",
+        "----------------------------------------------------------",
+        "Aggregate Advance Balance: {0:31.2f}".format(bsc.get_overall_advance_balance()),
+        "Interest Payable Balance: {0:32.2f}".format(bsc.get_overall_interest_payable_balance()),
+        "Total Interest Paid: {0:37.2f}".format(bsc.get_overall_interest_paid()),
+        "Balance Applicable to Future Advances: {0:>19.2f}".format(bsc.get_overall_payments_for_future()),
+    ])
+    click.echo("\n".join(lines))
 
 
 if __name__ == "__main__":
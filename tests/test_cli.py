@@ -1,16 +1,43 @@
 #!/usr/bin/env python3
-from cli import interface
+from balances import BalanceStatisticsCalculator
+from cli import interface, balances, create_db, load
 from click.testing import CliRunner
+from contextlib import redirect_stdout
+from datetime import date
+from unittest import mock
+import click
+import io
 import os
+import pickle
+import shutil
+import sqlite3
+import tempfile
 import unittest
 
+# test inputs directory, resolved from this file so it does not depend on the current directory.
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+
 
 def basename(test_file):
     """Generate basename from testfile path."""
-    return test_file.split("/")[-1].split(".")[0]
+    return os.path.splitext(os.path.basename(test_file))[0]
+
+
+def invoke_command(command, db_path=None, **params):
+    """
+    Invoke `command` callback directly within a click context, skipping CliRunner argv parsing and stdio isolation.
+    The context object is set up the same way `interface` does, by default with the database in the current directory.
+    Return the command output.
+    """
+    output = io.StringIO()
+    context_obj = {"DEBUG": False, "DB_PATH": db_path or os.path.join(os.getcwd(), "db.sqlite3")}
+    with click.Context(interface, obj=context_obj) as ctx, redirect_stdout(output):
+        ctx.invoke(command, **params)
+    return output.getvalue()
 
 
-TEST_INPUTS = [
+# (csv, end date, correct output file) balances test cases, files within TEST_DIR.
+_RAW_INPUTS = (
     (
         "test1.csv",
         "2021-05-25",
@@ -76,37 +103,131 @@ TEST_INPUTS = [
         "2022-01-11",
         "test7.correct.2022-01-11.txt",
     ),
-]
+)
+
+
+def _read_test_file(test_file):
+    """Read the content of `test_file` within TEST_DIR."""
+    with open(os.path.join(TEST_DIR, test_file), "r") as test_f:
+        return test_f.read()
+
+
+# (csv path, end date, correct output) balances test cases, correct outputs are read once at import time.
+TEST_INPUTS = tuple(
+    (os.path.join(TEST_DIR, test_filename), output_date, _read_test_file(output))
+    for test_filename, output_date, output in _RAW_INPUTS
+)
+
+
+def with_results_test_cases(test_class):
+    """
+    Class decorator that adds one `balances` results test case per TEST_INPUTS entry to `test_class`, so each of them
+    is reported, selected (-k) and distributed (pytest-xdist -n) on its own. Test cases are named
+    test_results_<csv basename>_<output date> and run test_class._test_results() with the entry values.
+    """
 
+    def make_test_results(name, test_filename, output_date, output):
+        def test_results(self):
+            self._test_results(test_filename, output_date, output)
 
+        test_results.__name__ = name
+        test_results.__qualname__ = f"{test_class.__qualname__}.{name}"
+        test_results.__doc__ = f"Test `balances` results of {os.path.basename(test_filename)} as of {output_date}."
+        return test_results
+
+    for test_filename, output_date, output in TEST_INPUTS:
+        name = f"test_results_{basename(test_filename)}_{output_date.replace('-', '_')}"
+        setattr(test_class, name, make_test_results(name, test_filename, output_date, output))
+    return test_class
+
+
+@with_results_test_cases
 class CLITest(unittest.TestCase):
     """Ampla ledger CLI test cases."""
 
-    def __init__(self, *args, **kwargs):
-        """Initialize test cases."""
-        super(CLITest, self).__init__(*args, **kwargs)
-        self.maxDiff = None
-        self.runner = CliRunner()
-        self.test_dir = os.path.join(os.getcwd(), "tests")
+    # temporary files root, memory backed when available so sqlite databases I/O does not hit the disk.
+    tmp_root = "/dev/shm" if os.path.isdir("/dev/shm") else "/tmp"
+    test_dir = TEST_DIR
+    runner = CliRunner()
+    maxDiff = None
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Create the class temporary directory and, within it, create and load a "golden" database once per
+        TEST_INPUTS csv, shared by the balances test cases. Test cases run within its "work" directory and
+        `balances` results are cached within it too, instead of the user cache directory.
+        """
+        # cleanups are registered right after each change, so they also run when a later setUpClass step fails.
+        cls.tmp_dir = tempfile.mkdtemp(dir=cls.tmp_root)
+        cls.addClassCleanup(shutil.rmtree, cls.tmp_dir)
+        cls.work_dir = os.path.join(cls.tmp_dir, "work")
+        os.mkdir(cls.work_dir)
+        cache_home_patcher = mock.patch.dict(os.environ, {"XDG_CACHE_HOME": os.path.join(cls.tmp_dir, "cache")})
+        cache_home_patcher.start()
+        cls.addClassCleanup(cache_home_patcher.stop)
+        cwd = os.getcwd()
+
+        # run `create-db` only once, golden databases start from a copy of this empty database.
+        template_dir = os.path.join(cls.tmp_dir, "template")
+        os.mkdir(template_dir)
+        os.chdir(template_dir)
+        try:
+            invoke_command(create_db)
+        finally:
+            os.chdir(cwd)
+        with open(os.path.join(template_dir, "db.sqlite3"), "rb") as db_f:
+            cls.empty_db_bytes = db_f.read()
+
+        cls.golden_dir = os.path.join(cls.tmp_dir, "golden")
+        os.mkdir(cls.golden_dir)
+        cls.golden_dbs = {}
+        for test_filename in sorted({test_filename for test_filename, _, _ in TEST_INPUTS}):
+            golden_db_dir = os.path.join(cls.golden_dir, basename(test_filename))
+            os.mkdir(golden_db_dir)
+            # the CLI works with the database in the current directory.
+            os.chdir(golden_db_dir)
+            try:
+                cls.create_empty_db()
+                invoke_command(load, filename=test_filename)
+            finally:
+                os.chdir(cwd)
+            cls.golden_dbs[test_filename] = os.path.join(golden_db_dir, "db.sqlite3")
+
+    @classmethod
+    def create_empty_db(cls) -> None:
+        """Create the database in the current directory as `create-db` does, from the empty database copy."""
+        with open(os.path.join(os.getcwd(), "db.sqlite3"), "wb") as db_f:
+            db_f.write(cls.empty_db_bytes)
 
     def setUp(self) -> None:
-        """Override setUp of test cases."""
+        """Override setUp of test cases: run them within the class work directory."""
         print(f"\nTesting :: {self._testMethodName}")
+        self.prev_cwd = os.getcwd()
+        os.chdir(self.work_dir)
+
+    def tearDown(self) -> None:
+        """Override tearDown of test cases: leave the class work directory empty for the next test case."""
+        os.chdir(self.prev_cwd)
+        for entry in os.listdir(self.work_dir):
+            entry_path = os.path.join(self.work_dir, entry)
+            if os.path.isdir(entry_path):
+                shutil.rmtree(entry_path)
+            else:
+                os.remove(entry_path)
 
     def test_create_db(self):
         """Test creation of DB."""
-        with self.runner.isolated_filesystem(temp_dir="/tmp"):
-            result = self.runner.invoke(interface, ["create-db"])
-            self.assertEqual(0, result.exit_code)
-            self.assertEqual(True, os.path.exists(os.path.join(os.getcwd(), "db.sqlite3")))
+        result = self.runner.invoke(interface, ["create-db"])
+        self.assertEqual(0, result.exit_code)
+        self.assertEqual(True, os.path.exists(os.path.join(os.getcwd(), "db.sqlite3")))
 
     def test_drop_db(self):
         """Test deletion of DB."""
-        with self.runner.isolated_filesystem(temp_dir="/tmp"):
-            self.runner.invoke(interface, ["create-db"])
-            result = self.runner.invoke(interface, ["drop-db"])
-            self.assertEqual(0, result.exit_code)
-            self.assertEqual(False, os.path.exists(os.path.join(os.getcwd(), "db.sqlite3")))
+        self.runner.invoke(interface, ["create-db"])
+        result = self.runner.invoke(interface, ["drop-db"])
+        self.assertEqual(0, result.exit_code)
+        self.assertEqual(False, os.path.exists(os.path.join(os.getcwd(), "db.sqlite3")))
 
     def test_load(self):
         """
@@ -114,40 +235,123 @@ class CLITest(unittest.TestCase):
         """
         test_file_1 = os.path.join(self.test_dir, "test1.csv")
         test_file_7 = os.path.join(self.test_dir, "test7.csv")
-        with self.runner.isolated_filesystem(temp_dir="/tmp"):
-            result = self.runner.invoke(interface, ["load", test_file_1])
-            self.assertEqual(0, result.exit_code)
-            self.assertEqual(
-                f"Database does not exist at {os.path.join(os.getcwd(), 'db.sqlite3')},"
-                f" please create it using `create-db` command\n",
-                result.output,
-            )
-            self.runner.invoke(interface, ["create-db"])
-            result = self.runner.invoke(interface, ["load", test_file_1])
-            self.assertEqual(0, result.exit_code)
-            self.assertEqual(f"Loaded 3 events from {test_file_1}\n", result.output)
-            self.runner.invoke(interface, ["drop-db"])
-            self.runner.invoke(interface, ["create-db"])
-            result = self.runner.invoke(interface, ["load", test_file_7])
-            self.assertEqual(0, result.exit_code)
-            self.assertEqual(f"Loaded 500 events from {test_file_7}\n", result.output)
-
-    def test_results(self):
-        """Test `balances` results against suite of correct output."""
-        for test_filename, output_date, output in TEST_INPUTS:
-            msg = f"Testing :: {test_filename} results of {output_date}"
-            print(msg)
-            with self.runner.isolated_filesystem(temp_dir="/tmp"), self.subTest(
-                msg=msg, test_filename=test_filename, output_date=output_date, output=output
-            ):
-                test_file_location = os.path.join(self.test_dir, test_filename)
-                self.runner.invoke(interface, ["create-db"])
-                self.runner.invoke(interface, ["load", test_file_location])
-                result = self.runner.invoke(interface, ["balances", output_date])
+        result = self.runner.invoke(interface, ["load", test_file_1])
+        self.assertEqual(0, result.exit_code)
+        self.assertEqual(
+            f"Database does not exist at {os.path.join(os.getcwd(), 'db.sqlite3')},"
+            f" please create it using `create-db` command\n",
+            result.output,
+        )
+        self.runner.invoke(interface, ["create-db"])
+        result = self.runner.invoke(interface, ["load", test_file_1])
+        self.assertEqual(0, result.exit_code)
+        self.assertEqual(f"Loaded 3 events from {test_file_1}\n", result.output)
+        self.runner.invoke(interface, ["drop-db"])
+        self.runner.invoke(interface, ["create-db"])
+        result = self.runner.invoke(interface, ["load", test_file_7])
+        self.assertEqual(0, result.exit_code)
+        self.assertEqual(f"Loaded 500 events from {test_file_7}\n", result.output)
+
+    def test_balances_large_amount(self):
+        """Test `balances` displays amounts beyond sqlite 64 bits integers once scaled without clamping them."""
+        large_amount_file = os.path.join(os.getcwd(), "large_amount.csv")
+        with open(large_amount_file, "w") as large_amount_f:
+            large_amount_f.write("advance,2021-01-01,100000000000\npayment,2021-01-01,0.01\n")
+        self.runner.invoke(interface, ["create-db"])
+        self.runner.invoke(interface, ["load", large_amount_file])
+        result = self.runner.invoke(interface, ["balances", "2021-01-01"])
+        self.assertEqual(0, result.exit_code)
+        self.assertIn("{0:>10}{1:>11}{2:>17}{3:>20}".format(1, "2021-01-01", "100000000000.00", "99999999999.99"),
+                      result.output)
+        self.assertIn("Aggregate Advance Balance: {0:>31}".format("99999999999.99"), result.output)
+
+    def test_balances_default_end_date(self):
+        """Test `balances` without `end_date` displays balance statistics as of today."""
+        golden_db = self.golden_dbs[os.path.join(self.test_dir, "test2.csv")]
+        shutil.copy(golden_db, os.path.join(os.getcwd(), "db.sqlite3"))
+        # separate cache homes so both invocations are calculated instead of the second one being a cache hit.
+        result = self.runner.invoke(interface, ["balances"], env={"XDG_CACHE_HOME": os.path.join(os.getcwd(), "cache")})
+        self.assertEqual(0, result.exit_code)
+        today_result = self.runner.invoke(
+            interface, ["balances", str(date.today())], env={"XDG_CACHE_HOME": os.path.join(os.getcwd(), "today_cache")}
+        )
+        self.assertEqual(today_result.output, result.output)
+
+    def test_balances_end_date_without_zero_padding(self):
+        """Test `balances` accepts `end_date` months and days without zero padding."""
+        golden_db = self.golden_dbs[os.path.join(self.test_dir, "test2.csv")]
+        shutil.copy(golden_db, os.path.join(os.getcwd(), "db.sqlite3"))
+        result = self.runner.invoke(interface, ["balances", "2021-7-8"])
+        self.assertEqual(0, result.exit_code)
+        self.assertEqual(_read_test_file("test2.correct.2021-07-08.txt"), result.output)
+
+    def _copy_golden_db(self, test_filename: str) -> dict:
+        """
+        Copy the golden database of `test_filename` csv as the current directory database.
+        return: `balances` invoke environment caching its results within the current directory "cache/ampla".
+        """
+        golden_db = self.golden_dbs[os.path.join(self.test_dir, test_filename)]
+        shutil.copy(golden_db, os.path.join(os.getcwd(), "db.sqlite3"))
+        return {"XDG_CACHE_HOME": os.path.join(os.getcwd(), "cache")}
+
+    def test_balances_cache(self):
+        """Test `balances` results read back from the results cache match the calculated ones."""
+        env = self._copy_golden_db("test2.csv")
+        result = self.runner.invoke(interface, ["balances", "2021-07-08"], env=env)
+        self.assertEqual(0, result.exit_code)
+        self.assertEqual(1, len(os.listdir(os.path.join(env["XDG_CACHE_HOME"], "ampla"))))
+        with mock.patch.object(BalanceStatisticsCalculator, "calculate_balance_statistics") as calculate:
+            cached_result = self.runner.invoke(interface, ["balances", "2021-07-08"], env=env)
+        calculate.assert_not_called()
+        self.assertEqual(0, cached_result.exit_code)
+        self.assertEqual(_read_test_file("test2.correct.2021-07-08.txt"), cached_result.output)
+
+    def test_balances_cache_invalid_entry(self):
+        """
+        Test `balances` recalculates results when the cache entry is unreadable or not a balance statistics result.
+        """
+        env = self._copy_golden_db("test2.csv")
+        cache_dir = os.path.join(env["XDG_CACHE_HOME"], "ampla")
+        for invalid_entry in (b"\x80\x09garbage", b"", pickle.dumps({})):
+            with self.subTest(invalid_entry=invalid_entry):
+                self.runner.invoke(interface, ["balances", "2021-07-08"], env=env)
+                for entry in os.listdir(cache_dir):
+                    with open(os.path.join(cache_dir, entry), "wb") as cache_file:
+                        cache_file.write(invalid_entry)
+                result = self.runner.invoke(interface, ["balances", "2021-07-08"], env=env)
                 self.assertEqual(0, result.exit_code)
-                output_path = f"{os.path.join(self.test_dir, output)}"
-                with open(output_path, "r") as correct_f:
-                    self.assertEqual(correct_f.read(), result.output)
+                self.assertEqual(_read_test_file("test2.correct.2021-07-08.txt"), result.output)
+
+    def test_balances_cache_wal_write(self):
+        """Test `balances` cached results are invalidated by WAL mode writes, and previous entries are pruned."""
+        env = self._copy_golden_db("test2.csv")
+        # keep the WAL connection open while running `balances` so the write is not checkpointed into the main file.
+        connection = sqlite3.connect(os.path.join(os.getcwd(), "db.sqlite3"))
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            result = self.runner.invoke(interface, ["balances", "2021-07-08"], env=env)
+            self.assertEqual(_read_test_file("test2.correct.2021-07-08.txt"), result.output)
+            connection.execute(
+                "insert into events (type, amount, date_created) values (?, ?, ?)", ("advance", 1000, "2021-07-08")
+            )
+            connection.commit()
+            result = self.runner.invoke(interface, ["balances", "2021-07-08"], env=env)
+            uncached_result = self.runner.invoke(
+                interface, ["balances", "2021-07-08"], env={"XDG_CACHE_HOME": os.path.join(os.getcwd(), "nocache")}
+            )
+        finally:
+            connection.close()
+        self.assertEqual(0, result.exit_code)
+        self.assertNotEqual(_read_test_file("test2.correct.2021-07-08.txt"), result.output)
+        self.assertEqual(uncached_result.output, result.output)
+        self.assertEqual(1, len(os.listdir(os.path.join(env["XDG_CACHE_HOME"], "ampla"))))
+
+    def _test_results(self, test_filename, output_date, output):
+        """Test `balances` results of `test_filename` as of `output_date` against `output` correct output."""
+        print(f"Testing :: {os.path.basename(test_filename)} results of {output_date}")
+        # `balances` only reads the database, so every date of the same csv runs against its golden database.
+        result_output = invoke_command(balances, db_path=self.golden_dbs[test_filename], end_date=output_date)
+        self.assertEqual(output, result_output)
 
 
 if __name__ == "__main__":